@@ -1,17 +1,30 @@
 #!/usr/bin/env python3
-from flask import Flask, request, jsonify, send_from_directory
-from flask_cors import CORS
+import os
+import asyncio
 import logging
+import orjson
+from pathlib import Path
+from typing import List, Optional
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, ValidationError
 from scam_detector import ScamDetector
+from batch_scheduler import BatchScheduler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+STATIC_DIR = Path(os.environ.get("STATIC_DIR", Path(__file__).resolve().parent / "static"))
 
-app = Flask(__name__, static_folder="static", static_url_path="/")
-CORS(app)
-
-detector = ScamDetector(model_dir='./models')
+detector = ScamDetector(
+    model_dir=os.environ.get("MODEL_DIR", "./models"),
+    use_hummingbird=os.environ.get("USE_HUMMINGBIRD", "0") == "1",
+    use_onnx=os.environ.get("USE_ONNX", "0") == "1",
+)
 
 try:
     detector.load_model()
@@ -19,128 +32,228 @@ try:
 except Exception as e:
     logger.error(f"Failed to load model: {e}")
 
+# Model inference runs here so it never blocks the event loop. Production runs
+# one uvicorn worker per core, so each process only needs a couple of threads.
+cpu_pool = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("CPU_POOL_SIZE", 2)),
+    thread_name_prefix="predict",
+)
+scheduler = BatchScheduler(
+    detector.predict_many,
+    executor=cpu_pool,
+    max_batch=int(os.environ.get("DETECT_MAX_BATCH", 64)),
+    max_wait_ms=float(os.environ.get("DETECT_MAX_WAIT_MS", 5)),
+)
+DETECT_TIMEOUT = float(os.environ.get("DETECT_TIMEOUT", 30))
 
 
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson, which also handles NumPy values."""
 
-@app.route("/")
-def serve_root():
-    return send_from_directory(app.static_folder, "index.html")
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
 
 
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'model_loaded': detector.is_trained
-    })
+CORS_HEADERS = [
+    (b'access-control-allow-origin', b'*'),
+    (b'access-control-allow-methods', b'POST, GET, OPTIONS'),
+]
 
 
-@app.route('/api/detect', methods=['POST'])
-def detect_scam():
-    """Detect scam in message."""
-    try:
-        data = request.get_json()
+class StaticCORSMiddleware:
+    """Adds fixed CORS headers and answers every preflight request directly.
 
-        if not data or 'message' not in data:
-            return jsonify({
-                'error': 'Message field is required'
-            }), 400
+    The API allows any origin, so unlike CORSMiddleware there is nothing to
+    inspect on ordinary requests. Preflights get back whichever request
+    headers they ask for, as under flask-cors.
+    """
 
-        message = data['message']
+    def __init__(self, app):
+        self.app = app
 
-        if not message or not message.strip():
-            return jsonify({
-                'error': 'Message cannot be empty'
-            }), 400
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-        result = detector.predict(message)
+        if scope['method'] == 'OPTIONS':
+            headers = CORS_HEADERS + [(b'access-control-max-age', b'86400')]
+            requested = dict(scope['headers']).get(b'access-control-request-headers')
+            if requested:
+                headers.append((b'access-control-allow-headers', requested))
 
-        return jsonify({
-            'success': True,
-            'data': result
-        })
+            await send({
+                'type': 'http.response.start',
+                'status': 204,
+                'headers': headers,
+            })
+            await send({'type': 'http.response.body', 'body': b''})
+            return
 
-    except Exception as e:
-        logger.error(f"Error processing request: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        async def send_with_cors(message):
+            if message['type'] == 'http.response.start':
+                message['headers'] = list(message.get('headers', [])) + CORS_HEADERS
+            await send(message)
 
+        await self.app(scope, receive, send_with_cors)
 
-@app.route('/api/analyze-url', methods=['POST'])
-def analyze_url():
-    """Analyze URL for suspicious characteristics."""
-    try:
-        data = request.get_json()
 
-        if not data or 'url' not in data:
-            return jsonify({
-                'error': 'URL field is required'
-            }), 400
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    scheduler.start()
+    yield
+    await scheduler.stop()
+    cpu_pool.shutdown(wait=False)
 
-        url = data['url']
 
-        if not url or not url.strip():
-            return jsonify({
-                'error': 'URL cannot be empty'
-            }), 400
+app = FastAPI(
+    title="WhatsApp Scam Detection API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+app.add_middleware(StaticCORSMiddleware)
 
-        result = detector.analyze_url(url)
 
-        return jsonify({
-            'success': True,
-            'data': result
-        })
+class DetectRequest(BaseModel):
+    message: str
 
-    except Exception as e:
-        logger.error(f"Error processing request: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
 
+class AnalyzeUrlRequest(BaseModel):
+    url: str
+
+
+class BatchDetectRequest(BaseModel):
+    messages: List[Optional[str]]
+
+
+# Error messages for requests whose body is missing its required field.
+REQUIRED_FIELD_ERRORS = {
+    '/api/detect': 'Message field is required',
+    '/api/analyze-url': 'URL field is required',
+    '/api/batch-detect': 'Messages array is required',
+}
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    """Report invalid request bodies as 400s, like the rest of the API."""
+    error = exc.errors()[0]
+
+    if error['type'] == 'list_type':
+        message = 'Messages must be an array'
+    elif error['type'] in ('missing', 'json_invalid', 'model_type', 'model_attributes_type'):
+        message = REQUIRED_FIELD_ERRORS.get(request.url.path, error['msg'])
+    else:
+        field = '.'.join(str(part) for part in error['loc'] if part != 'body')
+        message = f"{field}: {error['msg']}"
+
+    return ORJSONResponse({'error': message}, status_code=400)
+
+
+def error_response(e: Exception) -> JSONResponse:
+    logger.error(f"Error processing request: {e}")
+    return ORJSONResponse({
+        'success': False,
+        'error': str(e)
+    }, status_code=500)
+
+
+@app.get('/health')
+async def health():
+    """Health check endpoint."""
+    return ORJSONResponse({
+        'status': 'healthy',
+        'model_loaded': detector.is_trained
+    })
+
+
+@app.post('/api/detect')
+async def detect_scam(req: DetectRequest):
+    """Detect scam in message."""
+    if not req.message.strip():
+        return ORJSONResponse({
+            'error': 'Message cannot be empty'
+        }, status_code=400)
 
-@app.route('/api/batch-detect', methods=['POST'])
-def batch_detect():
-    """Batch detection for multiple messages."""
     try:
-        data = request.get_json()
+        result = await scheduler.submit(req.message, timeout=DETECT_TIMEOUT)
+    except asyncio.TimeoutError:
+        # The prediction queue is backed up; ask the client to retry.
+        logger.error(f"Prediction timed out after {DETECT_TIMEOUT:g}s")
+        return ORJSONResponse({
+            'success': False,
+            'error': f'Prediction timed out after {DETECT_TIMEOUT:g} seconds'
+        }, status_code=503)
+    except Exception as e:
+        return error_response(e)
+
+    return ORJSONResponse({
+        'success': True,
+        'data': result
+    })
+
+
+@app.post('/api/analyze-url')
+async def analyze_url(req: AnalyzeUrlRequest):
+    """Analyze URL for suspicious characteristics."""
+    if not req.url.strip():
+        return ORJSONResponse({
+            'error': 'URL cannot be empty'
+        }, status_code=400)
 
-        if not data or 'messages' not in data:
-            return jsonify({
-                'error': 'Messages array is required'
-            }), 400
+    try:
+        result = detector.analyze_url(req.url)
+    except Exception as e:
+        return error_response(e)
 
-        messages = data['messages']
+    return ORJSONResponse({
+        'success': True,
+        'data': result
+    })
 
-        if not isinstance(messages, list):
-            return jsonify({
-                'error': 'Messages must be an array'
-            }), 400
 
-        results = []
-        for message in messages:
-            if message and message.strip():
-                result = detector.predict(message)
-                results.append(result)
+@app.post('/api/batch-detect', openapi_extra={
+    'requestBody': {
+        'required': True,
+        'content': {'application/json': {'schema': BatchDetectRequest.model_json_schema()}},
+    }
+})
+async def batch_detect(request: Request):
+    """Batch detection for multiple messages."""
+    # Batch payloads can be large, so the body is decoded with orjson rather
+    # than the stdlib json module FastAPI would use.
+    try:
+        req = BatchDetectRequest.model_validate(orjson.loads(await request.body()))
+    except orjson.JSONDecodeError:
+        return ORJSONResponse({
+            'error': REQUIRED_FIELD_ERRORS['/api/batch-detect']
+        }, status_code=400)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
 
-        return jsonify({
-            'success': True,
-            'data': results,
-            'total': len(results)
-        })
+    messages = [m for m in req.messages if m and m.strip()]
 
+    try:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(cpu_pool, detector.predict_many, messages)
     except Exception as e:
-        logger.error(f"Error processing request: {e}")
-        return jsonify({
-            'success': False,
-            'error': str(e)
-        }), 500
+        return error_response(e)
+
+    return ORJSONResponse({
+        'success': True,
+        'data': results,
+        'total': len(results)
+    })
+
+
+# Mounted last so the API routes take precedence; serves index.html at "/".
+if STATIC_DIR.is_dir():
+    app.mount("/", StaticFiles(directory=STATIC_DIR, html=True), name="static")
 
 
 if __name__ == "__main__":
-    import os
+    import uvicorn
+
+    # Development server only; production runs uvicorn with several workers.
     port = int(os.environ.get("PORT", 8080))
-    app.run(host="0.0.0.0", port=port)
+    uvicorn.run(app, host="0.0.0.0", port=port)
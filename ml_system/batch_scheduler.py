@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import List, Dict, Tuple, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScheduler:
+    """Collects concurrent single-message requests into micro-batches.
+
+    A worker task waits for the first queued message, then keeps collecting
+    until either max_batch messages are queued or max_wait_ms has passed,
+    and runs predict_many once for the whole batch in the given executor so
+    the event loop stays free.
+    """
+
+    def __init__(self, predict_many: Callable[[List[str]], List[Dict[str, any]]],
+                 executor: Optional[Executor] = None,
+                 max_batch: int = 64, max_wait_ms: float = 5.0):
+        self.predict_many = predict_many
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._full: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the worker task on the running event loop."""
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the worker task."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def submit(self, text: str, timeout: Optional[float] = None) -> Dict[str, any]:
+        """Queue a message and wait until its prediction is available."""
+        if self._worker is None:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        if self._queue.qsize() >= self.max_batch:
+            self._full.set()
+
+        return await asyncio.wait_for(future, timeout)
+
+    async def _collect(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = [await self._queue.get()]
+
+        # Waiting on the event rather than on queue.get() means a timeout can
+        # never drop an item that was dequeued at the same moment.
+        if self._queue.qsize() + 1 < self.max_batch:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.max_wait)
+            except asyncio.TimeoutError:
+                pass
+        self._full.clear()
+
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect()
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self.predict_many, [text for text, _ in batch]
+                )
+            except Exception as e:
+                logger.error(f"Batch prediction failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            # Requests that timed out have already been cancelled.
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -1,24 +1,28 @@
 #!/usr/bin/env python3
 import argparse
 import logging
+from typing import List
 from scam_detector import ScamDetector
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def predict_message(message: str, model_dir: str = './models'):
-    """Predict if a message is scam."""
+def load_detector(model_dir: str = './models'):
+    """Load a trained detector, or return None if no model exists."""
     detector = ScamDetector(model_dir=model_dir)
 
     try:
         detector.load_model()
     except FileNotFoundError:
         logger.error("Model not found. Please train the model first using train.py")
-        return
+        return None
 
-    result = detector.predict(message)
+    return detector
 
+
+def print_result(result: dict):
+    """Print a prediction result."""
     print("\n" + "="*70)
     print("SCAM DETECTION ANALYSIS")
     print("="*70)
@@ -50,9 +54,33 @@ def predict_message(message: str, model_dir: str = './models'):
 
     print("="*70 + "\n")
 
+
+def predict_message(message: str, model_dir: str = './models'):
+    """Predict if a message is scam."""
+    detector = load_detector(model_dir)
+    if detector is None:
+        return
+
+    result = detector.predict(message)
+    print_result(result)
+
     return result
 
 
+def predict_messages(messages: List[str], model_dir: str = './models'):
+    """Predict several messages with one batched model call."""
+    detector = load_detector(model_dir)
+    if detector is None:
+        return
+
+    results = detector.predict_many(messages)
+    for result in results:
+        print_result(result)
+        print("\n")
+
+    return results
+
+
 def test_examples(model_dir: str = './models'):
     """Test with example messages."""
     test_messages = [
@@ -65,17 +93,7 @@ def test_examples(model_dir: str = './models'):
         "Panam jeyikum! Investment guarantee 100%. Contact: http://192.168.1.1/invest"
     ]
 
-    detector = ScamDetector(model_dir=model_dir)
-
-    try:
-        detector.load_model()
-    except FileNotFoundError:
-        logger.error("Model not found. Please train the model first using train.py")
-        return
-
-    for message in test_messages:
-        predict_message(message, model_dir)
-        print("\n")
+    return predict_messages(test_messages, model_dir)
 
 
 def main():
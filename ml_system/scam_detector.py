@@ -1,23 +1,152 @@
 #!/usr/bin/env python3
+import os
 import re
+import copy
+import json
+import hashlib
 import pickle
+import warnings
 import logging
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Tuple, Optional, Callable
+import threading
+import joblib
 import numpy as np
+import ahocorasick
+from cachetools import LRUCache
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_selection import SelectFromModel
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 
+try:
+    import hummingbird.ml as hummingbird
+except ImportError:
+    hummingbird = None
+
+try:
+    import onnxruntime
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+except ImportError:
+    onnxruntime = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+# Full URLs, bare domains and shortener links are scanned separately and
+# unioned. Their matches overlap (a full URL also contains a bare domain that
+# keeps going past characters the full-URL pattern stops at, such as '~' or
+# '#'), so a single alternation, which never overlaps, would miss them.
+_URL_RE = re.compile(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+')
+_DOMAIN_RE = re.compile(r'(?:www\.|[a-zA-Z0-9-]+\.(?:com|org|net|in|co|io|ai|app|xyz|info|biz|tk|ml|ga|cf|gq))[^\s]*')
+_SHORT_URL_RE = re.compile(r'(?:bit\.ly|tinyurl\.com|goo\.gl|ow\.ly|t\.co|cutt\.ly)/[a-zA-Z0-9]+')
+_IP_RE = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+
+PHISHING_KEYWORDS = [
+    'verify', 'login', 'account', 'secure', 'update', 'confirm',
+    'bank', 'paypal', 'amazon', 'suspended', 'urgent', 'click',
+    'prize', 'winner', 'free', 'claim', 'limited', 'offer'
+]
+URL_SHORTENERS = ['bit.ly', 'tinyurl', 'goo.gl', 't.co', 'cutt.ly']
+SUSPICIOUS_TLDS = ['.tk', '.ml', '.ga', '.cf', '.gq', '.xyz', '.top']
+
+
+def _build_url_term_automaton() -> ahocorasick.Automaton:
+    """Build one automaton matching every URL keyword, shortener and TLD."""
+    automaton = ahocorasick.Automaton()
+    for kind, terms in (('keyword', PHISHING_KEYWORDS),
+                        ('shortener', URL_SHORTENERS),
+                        ('tld', SUSPICIOUS_TLDS)):
+        for rank, term in enumerate(terms):
+            automaton.add_word(term, (kind, rank, term))
+    automaton.make_automaton()
+    return automaton
+
+
+_URL_TERMS = _build_url_term_automaton()
+
+# URL heuristics scored after the keyword hits (15 points each).
+_URL_CHECKS = [
+    (20, "Shortened URL"),
+    (25, "Contains @ symbol"),
+    (20, "Multiple slashes"),
+    (15, "Suspicious TLD"),
+    (20, "IP address in URL"),
+    (10, "Unusually long URL"),
+    (10, "Multiple hyphens"),
+]
+_URL_CHECK_POINTS = np.array([points for points, _ in _URL_CHECKS], dtype=np.int64)
+URL_CACHE_SIZE = 4096
+
+# Bumped whenever saved artifacts stop being compatible with this code.
+# Version 2 feeds raw text to the vectorizer instead of preprocess_text output.
+MODEL_VERSION = 2
+
+# RandomForest settings; overridden by hyperparams.json (written by tune.py)
+# in the model directory.
+DEFAULT_CLASSIFIER_PARAMS = {
+    'n_estimators': 50,
+    'max_depth': 12,
+    'min_samples_split': 5,
+    'min_samples_leaf': 2,
+    'random_state': 42,
+    'n_jobs': -1,
+}
+HYPERPARAMS_FILE = 'hyperparams.json'
+
+# Largest dense float32 batch handed to the classifier; bigger ones stay sparse.
+DENSE_BATCH_BYTES = 64 * 1024 * 1024
+
+
+def _write_atomic(path: Path, write: Callable[[Path], None]):
+    """Write a file through a temporary path and swap it into place.
+
+    A worker loading the model while it is being saved then sees either the
+    old file or the new one, never a half-written one.
+    """
+    tmp_path = path.with_name(f'.tmp-{path.name}')
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file, read in chunks so large models stay out of memory."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class OnnxClassifier:
+    """predict_proba wrapper around an ONNX Runtime session."""
+
+    def __init__(self, model: bytes):
+        self.model = model
+        self.session = onnxruntime.InferenceSession(model, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.session.run(['probabilities'], {self.input_name: X})[0]
+
 
 class ScamDetector:
     """ML-based scam message detector with URL analysis."""
 
-    def __init__(self, model_dir: str = './models', stop_words_path: Optional[str] = None):
+    # Above this text scam probability the message is a scam whatever its URLs
+    # score (0.6 * 0.95 already clears the 0.5 cutoff), so URL extraction and
+    # analysis are skipped. Thresholds below 5/6 could change verdicts.
+    url_skip_threshold = 0.95
+
+    def __init__(self, model_dir: str = './models', stop_words_path: Optional[str] = None,
+                 use_hummingbird: bool = False, use_onnx: bool = False,
+                 cache_size: Optional[int] = None,
+                 feature_selection_threshold: Optional[str] = 'median'):
         self.model_dir = Path(model_dir)
         self.model_dir.mkdir(parents=True, exist_ok=True)
 
@@ -26,103 +155,155 @@ class ScamDetector:
             ngram_range=(1, 3),
             min_df=1,
             max_df=0.95,
-            stop_words='english'
+            stop_words='english',
+            lowercase=True,
+            # Runs of two or more word characters, so punctuation never ends
+            # up in a token and no separate cleanup pass is needed.
+            token_pattern=r'(?u)\b\w\w+\b'
         )
 
-        self.classifier = RandomForestClassifier(
-            n_estimators=200,
-            max_depth=50,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-            n_jobs=-1
-        )
+        self.classifier = RandomForestClassifier(**self.load_hyperparams())
 
-        self.is_trained = False
+        # Terms whose importance falls below this SelectFromModel threshold are
+        # dropped after the first fit; None keeps the full vocabulary.
+        self.feature_selection_threshold = feature_selection_threshold
 
-    def preprocess_text(self, text: str) -> str:
-        """Clean and normalize text."""
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        if use_hummingbird and hummingbird is None:
+            logger.warning("hummingbird-ml is not installed, using scikit-learn classifier")
+            use_hummingbird = False
+        self.use_hummingbird = use_hummingbird
+        self._hb_model = None
 
-    def extract_urls(self, text: str) -> List[str]:
-        """Extract URLs from text."""
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        url_pattern_simple = r'(?:www\.|[a-zA-Z0-9-]+\.(?:com|org|net|in|co|io|ai|app|xyz|info|biz|tk|ml|ga|cf|gq))[^\s]*'
-
-        urls = re.findall(url_pattern, text)
-        urls += re.findall(url_pattern_simple, text)
-
-        shortened_pattern = r'(?:bit\.ly|tinyurl\.com|goo\.gl|ow\.ly|t\.co|cutt\.ly)/[a-zA-Z0-9]+'
-        urls += re.findall(shortened_pattern, text)
-
-        return list(set(urls))
-
-    def analyze_url(self, url: str) -> Dict[str, any]:
-        """Analyze URL for suspicious characteristics."""
-        suspicion_score = 0
-        reasons = []
+        if use_onnx and onnxruntime is None:
+            logger.warning("skl2onnx/onnxruntime are not installed, using scikit-learn classifier")
+            use_onnx = False
+        self.use_onnx = use_onnx
+        self._onnx_model = None
 
-        url_lower = url.lower()
+        # Scam blasts forward the same message many times, so results are
+        # cached by message text. PREDICT_CACHE=0 disables the cache.
+        if cache_size is None:
+            cache_size = int(os.environ.get('PREDICT_CACHE', 10000))
+        self._cache = LRUCache(maxsize=cache_size) if cache_size > 0 else None
+        self._cache_lock = threading.Lock()
 
-        phishing_keywords = [
-            'verify', 'login', 'account', 'secure', 'update', 'confirm',
-            'bank', 'paypal', 'amazon', 'suspended', 'urgent', 'click',
-            'prize', 'winner', 'free', 'claim', 'limited', 'offer'
-        ]
+        # URL analysis does not depend on the model, and scam blasts share a
+        # handful of URLs across many messages.
+        self._url_cache = LRUCache(maxsize=URL_CACHE_SIZE)
+        self._url_cache_lock = threading.Lock()
 
-        for keyword in phishing_keywords:
-            if keyword in url_lower:
-                suspicion_score += 15
-                reasons.append(f"Contains keyword: {keyword}")
+        self.is_trained = False
 
-        if any(shortener in url_lower for shortener in ['bit.ly', 'tinyurl', 'goo.gl', 't.co', 'cutt.ly']):
-            suspicion_score += 20
-            reasons.append("Shortened URL")
+    def load_hyperparams(self) -> Dict[str, any]:
+        """Classifier parameters, with overrides from hyperparams.json if present."""
+        params = dict(DEFAULT_CLASSIFIER_PARAMS)
+        hyperparams_path = self.model_dir / HYPERPARAMS_FILE
 
-        if '@' in url:
-            suspicion_score += 25
-            reasons.append("Contains @ symbol")
+        if hyperparams_path.exists():
+            with open(hyperparams_path) as f:
+                params.update(json.load(f))
+            logger.info(f"Loaded hyperparameters from {hyperparams_path}")
 
-        if url.count('//') > 1:
-            suspicion_score += 20
-            reasons.append("Multiple slashes")
+        return params
 
-        suspicious_tlds = ['.tk', '.ml', '.ga', '.cf', '.gq', '.xyz', '.top']
-        if any(tld in url_lower for tld in suspicious_tlds):
-            suspicion_score += 15
-            reasons.append("Suspicious TLD")
+    def preprocess_text(self, text: str) -> str:
+        """Clean and normalize text.
 
-        if re.search(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}', url):
-            suspicion_score += 20
-            reasons.append("IP address in URL")
+        Deprecated: the vectorizer lowercases and tokenizes raw text itself.
+        """
+        warnings.warn(
+            "preprocess_text is deprecated; pass raw text to the vectorizer",
+            DeprecationWarning, stacklevel=2
+        )
+        text = text.lower()
+        text = _PUNCT_RE.sub(' ', text)
+        text = _WS_RE.sub(' ', text).strip()
+        return text
 
-        if len(url) > 100:
-            suspicion_score += 10
-            reasons.append("Unusually long URL")
+    def extract_urls(self, text: str) -> List[str]:
+        """Extract URLs from text."""
+        urls = _URL_RE.findall(text)
+        urls += _DOMAIN_RE.findall(text)
+        urls += _SHORT_URL_RE.findall(text)
 
-        if url_lower.count('-') > 3:
-            suspicion_score += 10
-            reasons.append("Multiple hyphens")
+        return list(dict.fromkeys(urls))
 
-        suspicion_score = min(suspicion_score, 100)
+    def analyze_url(self, url: str) -> Dict[str, any]:
+        """Analyze URL for suspicious characteristics."""
+        return self.analyze_urls([url])[0]
+
+    def analyze_urls(self, urls: List[str]) -> List[Dict[str, any]]:
+        """Analyze several URLs, reusing cached results for repeated ones."""
+        results = {}
+        with self._url_cache_lock:
+            for url in urls:
+                cached = self._url_cache.get(url)
+                if cached is not None:
+                    results[url] = cached
+
+        misses = [url for url in dict.fromkeys(urls) if url not in results]
+        if misses:
+            computed = self._score_urls(misses)
+            with self._url_cache_lock:
+                for url, result in zip(misses, computed):
+                    self._url_cache[url] = result
+            results.update(zip(misses, computed))
+
+        return [copy.copy(results[url]) for url in urls]
+
+    def _score_urls(self, urls: List[str]) -> List[Dict[str, any]]:
+        """Score unique URLs, computing each heuristic as a column over the batch."""
+        n = len(urls)
+        lowered = [url.lower() for url in urls]
+
+        term_matches = [{term for _, term in _URL_TERMS.iter(url_lower)} for url_lower in lowered]
+        keywords = [
+            [keyword for kind, _, keyword in sorted(matches) if kind == 'keyword']
+            for matches in term_matches
+        ]
 
-        return {
-            'url': url,
-            'suspicion_score': suspicion_score,
-            'is_suspicious': suspicion_score >= 40,
-            'reasons': reasons
-        }
+        # Every textual test runs on the lowered copy; none of them ('/', '-',
+        # '@', digits) depends on case. Lengths come from the original,
+        # since lowercasing can change the length of some non-ASCII text.
+        lengths = np.fromiter((len(url) for url in urls), dtype=np.int64, count=n)
+        slashes = np.fromiter((url_lower.count('//') for url_lower in lowered), dtype=np.int64, count=n)
+        hyphens = np.fromiter((url_lower.count('-') for url_lower in lowered), dtype=np.int64, count=n)
+
+        # One row per heuristic after the keyword hits, in reporting order.
+        flags = np.array([
+            [any(kind == 'shortener' for kind, _, _ in matches) for matches in term_matches],
+            ['@' in url_lower for url_lower in lowered],
+            slashes > 1,
+            [any(kind == 'tld' for kind, _, _ in matches) for matches in term_matches],
+            [_IP_RE.search(url_lower) is not None for url_lower in lowered],
+            lengths > 100,
+            hyphens > 3,
+        ], dtype=bool)
+
+        keyword_counts = np.fromiter((len(k) for k in keywords), dtype=np.int64, count=n)
+        scores = keyword_counts * 15 + _URL_CHECK_POINTS @ flags
+        scores = np.minimum(scores, 100)
+
+        results = []
+        for i, url in enumerate(urls):
+            reasons = [f"Contains keyword: {keyword}" for keyword in keywords[i]]
+            reasons += [reason for (_, reason), flag in zip(_URL_CHECKS, flags[:, i]) if flag]
+            suspicion_score = int(scores[i])
+
+            results.append({
+                'url': url,
+                'suspicion_score': suspicion_score,
+                'is_suspicious': suspicion_score >= 40,
+                'reasons': reasons
+            })
+
+        return results
 
     def train(self, texts: List[str], labels: List[int],
               test_size: float = 0.2, save: bool = True) -> Dict[str, float]:
         """Train the model."""
-        processed_texts = [self.preprocess_text(text) for text in texts]
-
         X_train, X_test, y_train, y_test = train_test_split(
-            processed_texts, labels,
+            texts, labels,
             test_size=test_size,
             random_state=42,
             stratify=labels
@@ -130,10 +311,11 @@ class ScamDetector:
 
         logger.info(f"Training samples: {len(X_train)}, Test samples: {len(X_test)}")
 
-        X_train_vec = self.vectorizer.fit_transform(X_train)
+        self.fit(X_train, y_train)
         X_test_vec = self.vectorizer.transform(X_test)
-
-        self.classifier.fit(X_train_vec, y_train)
+        self.clear_cache()
+        self._hb_model = self._convert_hummingbird() if self.use_hummingbird else None
+        self._onnx_model = self._convert_onnx() if self.use_onnx else None
 
         y_pred = self.classifier.predict(X_test_vec)
 
@@ -157,82 +339,330 @@ class ScamDetector:
 
         return metrics
 
+    def fit(self, texts: List[str], labels: List[int]):
+        """Fit the vectorizer and classifier on all given messages, pruning unimportant terms."""
+        # Start from an unpruned vocabulary even when retraining.
+        vectorizer = clone(self.vectorizer).set_params(vocabulary=None)
+        X_vec = vectorizer.fit_transform(texts)
+        self.classifier.fit(X_vec, labels)
+
+        if self.feature_selection_threshold is not None:
+            support = SelectFromModel(
+                self.classifier,
+                threshold=self.feature_selection_threshold,
+                prefit=True
+            ).get_support()
+            # Most importances are exactly zero on small corpora, which drags
+            # the median to zero, so zero-importance terms are always dropped.
+            support &= self.classifier.feature_importances_ > 0
+
+            if not support.all():
+                logger.info(f"Feature selection kept {support.sum()} of {len(support)} terms")
+                vectorizer = self._pruned_vectorizer(vectorizer, support)
+                X_vec = vectorizer.fit_transform(texts)
+                self.classifier.fit(X_vec, labels)
+
+        self.vectorizer = vectorizer
+        return self
+
+    def _pruned_vectorizer(self, vectorizer: TfidfVectorizer,
+                           support: np.ndarray) -> TfidfVectorizer:
+        """Unfitted copy of vectorizer restricted to the selected columns."""
+        vocabulary = vectorizer.vocabulary_
+        terms = sorted(vocabulary, key=vocabulary.get)
+        kept_terms = [term for term in terms if support[vocabulary[term]]]
+        return clone(vectorizer).set_params(vocabulary=kept_terms)
+
     def predict(self, text: str) -> Dict[str, any]:
         """Predict if message is scam."""
+        return self.predict_many([text])[0]
+
+    def predict_many(self, texts: List[str]) -> List[Dict[str, any]]:
+        """Predict a batch of messages, reusing cached results for repeated texts."""
         if not self.is_trained:
             raise ValueError("Model not trained. Call train() first or load a trained model.")
 
-        processed_text = self.preprocess_text(text)
-        X = self.vectorizer.transform([processed_text])
-
-        prediction = self.classifier.predict(X)[0]
-        probability = self.classifier.predict_proba(X)[0]
-
-        urls = self.extract_urls(text)
-        url_analyses = [self.analyze_url(url) for url in urls]
-
-        max_url_score = max([ua['suspicion_score'] for ua in url_analyses], default=0)
-        has_suspicious_urls = any([ua['is_suspicious'] for ua in url_analyses])
-
-        text_scam_prob = probability[1]
-        url_risk_factor = max_url_score / 100.0
-
-        combined_score = (text_scam_prob * 0.6) + (url_risk_factor * 0.4)
-
-        final_prediction = 1 if combined_score >= 0.5 else 0
-
-        if has_suspicious_urls and final_prediction == 0:
-            final_prediction = 1
-            combined_score = max(combined_score, 0.6)
-
-        reasons = []
-        if text_scam_prob > 0.6:
-            reasons.append(f"High scam probability in text ({text_scam_prob:.2%})")
-        if has_suspicious_urls:
-            reasons.append("Contains suspicious URLs")
-        if final_prediction == 0:
-            reasons.append("Message appears safe")
-
-        return {
-            'text': text,
-            'is_scam': bool(final_prediction),
-            'confidence': float(combined_score),
-            'text_scam_probability': float(text_scam_prob),
-            'text_safe_probability': float(probability[0]),
-            'urls_found': len(urls),
-            'url_analyses': url_analyses,
-            'has_suspicious_urls': has_suspicious_urls,
-            'max_url_suspicion_score': max_url_score,
-            'reasons': reasons,
-            'verdict': 'SCAM' if final_prediction == 1 else 'SAFE'
-        }
+        if not texts:
+            return []
+
+        if self._cache is None:
+            return self._predict_uncached(texts)
+
+        results = [None] * len(texts)
+        misses = {}
+        with self._cache_lock:
+            for i, text in enumerate(texts):
+                cached = self._cache.get(text)
+                if cached is not None:
+                    results[i] = copy.copy(cached)
+                else:
+                    misses.setdefault(text, []).append(i)
+
+        if misses:
+            computed = self._predict_uncached(list(misses))
+            with self._cache_lock:
+                for text, result in zip(misses, computed):
+                    self._cache[text] = result
+            for text, result in zip(misses, computed):
+                for i in misses[text]:
+                    results[i] = copy.copy(result)
+
+        return results
+
+    def _predict_uncached(self, texts: List[str]) -> List[Dict[str, any]]:
+        """Run the model on a batch of messages, bypassing the result cache."""
+        X = self.vectorizer.transform(texts)
+
+        probabilities = self._predict_proba(X)
+        text_scam_probs = probabilities[:, 1]
+
+        urls_per_text = [
+            self.extract_urls(text) if text_scam_prob <= self.url_skip_threshold else []
+            for text, text_scam_prob in zip(texts, text_scam_probs)
+        ]
+        all_analyses = self.analyze_urls([url for urls in urls_per_text for url in urls])
+
+        results = []
+        offset = 0
+        for text, urls, probability, text_scam_prob in zip(texts, urls_per_text,
+                                                           probabilities, text_scam_probs):
+            url_analyses = all_analyses[offset:offset + len(urls)]
+            offset += len(urls)
+
+            max_url_score = max([ua['suspicion_score'] for ua in url_analyses], default=0)
+            has_suspicious_urls = any([ua['is_suspicious'] for ua in url_analyses])
+
+            url_risk_factor = max_url_score / 100.0
+
+            combined_score = (text_scam_prob * 0.6) + (url_risk_factor * 0.4)
+
+            final_prediction = 1 if combined_score >= 0.5 else 0
+
+            if has_suspicious_urls and final_prediction == 0:
+                final_prediction = 1
+                combined_score = max(combined_score, 0.6)
+
+            reasons = []
+            if text_scam_prob > 0.6:
+                reasons.append(f"High scam probability in text ({text_scam_prob:.2%})")
+            if has_suspicious_urls:
+                reasons.append("Contains suspicious URLs")
+            if final_prediction == 0:
+                reasons.append("Message appears safe")
+
+            results.append({
+                'text': text,
+                'is_scam': bool(final_prediction),
+                'confidence': float(combined_score),
+                'text_scam_probability': float(text_scam_prob),
+                'text_safe_probability': float(probability[0]),
+                'urls_found': len(urls),
+                'url_analyses': url_analyses,
+                'has_suspicious_urls': has_suspicious_urls,
+                'max_url_suspicion_score': max_url_score,
+                'reasons': reasons,
+                'verdict': 'SCAM' if final_prediction == 1 else 'SAFE'
+            })
+
+        return results
+
+    def clear_cache(self):
+        """Drop cached predictions, e.g. after the model changed."""
+        if self._cache is not None:
+            with self._cache_lock:
+                self._cache.clear()
+
+    def _predict_proba(self, X) -> np.ndarray:
+        """Class probabilities from the fastest available classifier backend."""
+        # Trees compare float32 features; converting here saves the copy that
+        # scikit-learn would otherwise make while validating the input.
+        X = X.astype(np.float32, copy=False)
+
+        # Dense rows avoid the sparse tree-walk path and are required by the
+        # tensor backends, as long as the batch fits the memory budget.
+        if X.shape[0] * X.shape[1] * X.dtype.itemsize > DENSE_BATCH_BYTES:
+            return self.classifier.predict_proba(X)
+
+        X = X.toarray()
+        model = self._onnx_model or self._hb_model
+        if model is not None:
+            return model.predict_proba(X)
+        return self.classifier.predict_proba(X)
+
+    def _convert_hummingbird(self):
+        """Compile the fitted RandomForest into PyTorch tensor operations."""
+        try:
+            # The GEMM strategy does not support the tree value layout of newer
+            # scikit-learn releases, so always use tree traversal.
+            return hummingbird.convert(
+                self.classifier, 'pytorch',
+                extra_config={'tree_implementation': 'perf_tree_trav'}
+            )
+        except Exception as e:
+            logger.warning(f"Hummingbird conversion failed, using scikit-learn classifier: {e}")
+            return None
+
+    def _convert_onnx(self) -> Optional[OnnxClassifier]:
+        """Export the fitted RandomForest to an ONNX TreeEnsemble graph."""
+        try:
+            onx = convert_sklearn(
+                self.classifier,
+                initial_types=[('input', FloatTensorType([None, self.classifier.n_features_in_]))],
+                options={'zipmap': False}
+            )
+            return OnnxClassifier(onx.SerializeToString())
+        except Exception as e:
+            logger.warning(f"ONNX export failed, using scikit-learn classifier: {e}")
+            return None
 
     def save_model(self):
         """Save trained model."""
-        vectorizer_path = self.model_dir / 'vectorizer.pkl'
-        classifier_path = self.model_dir / 'classifier.pkl'
-
-        with open(vectorizer_path, 'wb') as f:
-            pickle.dump(self.vectorizer, f)
-
-        with open(classifier_path, 'wb') as f:
-            pickle.dump(self.classifier, f)
+        # The vocabulary is a dict with one entry per feature, which is slow to
+        # unpickle. Store it as two flat arrays instead, and drop stop_words_,
+        # the set of pruned terms that is only kept for introspection. A
+        # pruned vectorizer also holds its terms in the vocabulary parameter;
+        # fixed_vocabulary_ still records that it was given one.
+        vectorizer = copy.copy(self.vectorizer)
+        vocabulary = vectorizer.__dict__.pop('vocabulary_')
+        vectorizer.__dict__.pop('stop_words_', None)
+        vectorizer.vocabulary = None
+        terms = np.array(list(vocabulary), dtype=np.str_)
+        indices = np.fromiter(vocabulary.values(), dtype=np.int32, count=len(vocabulary))
+
+        _write_atomic(self.model_dir / 'vocab_terms.npy', lambda p: np.save(p, terms))
+        _write_atomic(self.model_dir / 'vocab_indices.npy', lambda p: np.save(p, indices))
+        _write_atomic(self.model_dir / 'vectorizer.joblib',
+                      lambda p: joblib.dump(vectorizer, p, compress=3))
+        _write_atomic(self.model_dir / 'classifier.joblib',
+                      lambda p: joblib.dump(self.classifier, p, compress=3))
+
+        # Compiled classifiers are tagged with the classifier they were built
+        # from, and removed when none was built, so a later load never
+        # picks up one that belongs to an older model.
+        fingerprint = self._classifier_fingerprint()
+        backends = {}
+
+        hb_path = self.model_dir / 'classifier_hb.zip'
+        digest_path = self.model_dir / 'classifier_hb.digest'
+        if self._hb_model is not None:
+            digest = self._hb_model.save(str(self.model_dir / 'classifier_hb'))
+            digest_path.write_text(digest)
+            backends['hummingbird'] = fingerprint
+        else:
+            hb_path.unlink(missing_ok=True)
+            digest_path.unlink(missing_ok=True)
+
+        onnx_path = self.model_dir / 'classifier.onnx'
+        if self._onnx_model is not None:
+            _write_atomic(onnx_path, lambda p: p.write_bytes(self._onnx_model.model))
+            backends['onnx'] = fingerprint
+        else:
+            onnx_path.unlink(missing_ok=True)
+
+        with open(self.model_dir / 'model_info.json', 'w') as f:
+            json.dump({'model_version': MODEL_VERSION, 'backends': backends}, f)
 
         logger.info(f"Model saved to {self.model_dir}")
 
     def load_model(self):
         """Load trained model."""
-        vectorizer_path = self.model_dir / 'vectorizer.pkl'
-        classifier_path = self.model_dir / 'classifier.pkl'
-
-        if not vectorizer_path.exists() or not classifier_path.exists():
-            raise FileNotFoundError(f"Model files not found in {self.model_dir}")
-
-        with open(vectorizer_path, 'rb') as f:
-            self.vectorizer = pickle.load(f)
-
-        with open(classifier_path, 'rb') as f:
-            self.classifier = pickle.load(f)
+        self.vectorizer = self._load_artifact('vectorizer')
+        if not hasattr(self.vectorizer, 'vocabulary_'):
+            self.vectorizer.vocabulary_ = self._load_vocabulary()
+        self.classifier = self._load_artifact('classifier')
+        # Training uses every core, but a loaded model serves from several
+        # worker processes at once, so each prediction walks the trees on
+        # the calling thread.
+        self.classifier.set_params(n_jobs=1)
+
+        info_path = self.model_dir / 'model_info.json'
+        info = {}
+        if info_path.exists():
+            with open(info_path) as f:
+                info = json.load(f)
+        model_version = info.get('model_version', 1)
+        if model_version != MODEL_VERSION:
+            logger.warning(
+                f"Model in {self.model_dir} has version {model_version}, expected "
+                f"{MODEL_VERSION}. Retrain with train.py to refresh the artifacts."
+            )
+
+        self._hb_model = None
+        if self.use_hummingbird:
+            self._load_hummingbird(info.get('backends', {}).get('hummingbird'))
+
+        self._onnx_model = None
+        if self.use_onnx:
+            self._load_onnx(info.get('backends', {}).get('onnx'))
+
+        self.clear_cache()
 
         self.is_trained = True
         logger.info(f"Model loaded from {self.model_dir}")
+
+    def _load_artifact(self, name: str):
+        """Load a joblib artifact, falling back to the legacy pickle format."""
+        joblib_path = self.model_dir / f'{name}.joblib'
+        pickle_path = self.model_dir / f'{name}.pkl'
+
+        if joblib_path.exists():
+            return joblib.load(joblib_path)
+
+        if pickle_path.exists():
+            with open(pickle_path, 'rb') as f:
+                return pickle.load(f)
+
+        raise FileNotFoundError(f"Model files not found in {self.model_dir}")
+
+    def _load_vocabulary(self) -> Dict[str, int]:
+        """Rebuild the vectorizer vocabulary from its saved term/index arrays."""
+        terms_path = self.model_dir / 'vocab_terms.npy'
+        indices_path = self.model_dir / 'vocab_indices.npy'
+
+        if not terms_path.exists() or not indices_path.exists():
+            raise FileNotFoundError(f"Vocabulary files not found in {self.model_dir}")
+
+        terms = np.load(terms_path, mmap_mode='r')
+        indices = np.load(indices_path, mmap_mode='r')
+        return dict(zip(terms.tolist(), indices.tolist()))
+
+    def _classifier_fingerprint(self) -> str:
+        """Identify the saved classifier that compiled backends are built from."""
+        path = self.model_dir / 'classifier.joblib'
+        if not path.exists():
+            path = self.model_dir / 'classifier.pkl'
+        return f"{_file_sha256(path)}:{self.classifier.n_features_in_}"
+
+    def _load_hummingbird(self, fingerprint: Optional[str] = None):
+        """Load the compiled classifier, converting it if it is missing or stale."""
+        hb_path = self.model_dir / 'classifier_hb.zip'
+        digest_path = self.model_dir / 'classifier_hb.digest'
+
+        if hb_path.exists() and fingerprint != self._classifier_fingerprint():
+            logger.warning("Hummingbird model does not match the classifier, converting again")
+        elif hb_path.exists() and digest_path.exists():
+            try:
+                self._hb_model = hummingbird.load(
+                    str(self.model_dir / 'classifier_hb'),
+                    digest=digest_path.read_text().strip()
+                )
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load Hummingbird model, converting again: {e}")
+
+        self._hb_model = self._convert_hummingbird()
+
+    def _load_onnx(self, fingerprint: Optional[str] = None):
+        """Load the exported ONNX classifier, exporting it if it is missing or stale."""
+        onnx_path = self.model_dir / 'classifier.onnx'
+
+        if onnx_path.exists() and fingerprint != self._classifier_fingerprint():
+            logger.warning("ONNX model does not match the classifier, exporting again")
+        elif onnx_path.exists():
+            try:
+                self._onnx_model = OnnxClassifier(onnx_path.read_bytes())
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX model, exporting again: {e}")
+
+        self._onnx_model = self._convert_onnx()
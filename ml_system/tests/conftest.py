@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The ml_system modules are run as scripts and import each other by name.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,174 @@
+import sys
+import time
+import importlib
+import pytest
+from fastapi.testclient import TestClient
+from train import create_sample_dataset, train_model
+
+SCAM_MESSAGE = "URGENT! Your bank account has been suspended. Click http://secure-bank-verify.tk/login"
+
+
+@pytest.fixture(scope='module')
+def model_dir(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('api')
+    dataset_path = create_sample_dataset(str(tmp_path / 'sample_dataset.csv'))
+    train_model(dataset_path, model_dir=str(tmp_path / 'models'))
+    return str(tmp_path / 'models')
+
+
+@pytest.fixture
+def api(model_dir, tmp_path, monkeypatch):
+    """A freshly imported api module serving the sample model."""
+    static_dir = tmp_path / 'static'
+    static_dir.mkdir()
+    (static_dir / 'index.html').write_text('<h1>Scam Detector</h1>')
+
+    monkeypatch.setenv('MODEL_DIR', model_dir)
+    monkeypatch.setenv('STATIC_DIR', str(static_dir))
+    sys.modules.pop('api', None)
+    return importlib.import_module('api')
+
+
+@pytest.fixture
+def client(api):
+    with TestClient(api.app) as client:
+        yield client
+
+
+def test_health(client):
+    response = client.get('/health')
+
+    assert response.status_code == 200
+    assert response.json() == {'status': 'healthy', 'model_loaded': True}
+
+
+def test_detect(client):
+    response = client.post('/api/detect', json={'message': SCAM_MESSAGE})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['success'] is True
+    assert body['data']['text'] == SCAM_MESSAGE
+    assert body['data']['verdict'] == 'SCAM'
+
+
+def test_detect_timeout(api, client, monkeypatch):
+    def slow_predict_many(texts):
+        time.sleep(0.5)
+        return api.detector.predict_many(texts)
+
+    monkeypatch.setattr(api.scheduler, 'predict_many', slow_predict_many)
+    monkeypatch.setattr(api, 'DETECT_TIMEOUT', 0.05)
+    response = client.post('/api/detect', json={'message': SCAM_MESSAGE})
+
+    assert response.status_code == 503
+    assert response.json() == {'success': False, 'error': 'Prediction timed out after 0.05 seconds'}
+
+
+def test_analyze_url(client):
+    response = client.post('/api/analyze-url', json={'url': 'bit.ly/claim123'})
+
+    assert response.status_code == 200
+    assert response.json() == {'success': True, 'data': {
+        'url': 'bit.ly/claim123',
+        'suspicion_score': 35,
+        'is_suspicious': False,
+        'reasons': ['Contains keyword: claim', 'Shortened URL'],
+    }}
+
+
+def test_batch_detect_drops_empty_messages(client):
+    response = client.post('/api/batch-detect',
+                           json={'messages': [SCAM_MESSAGE, '', '   ', None, 'See you tomorrow']})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body['success'] is True
+    assert body['total'] == 2
+    assert [result['text'] for result in body['data']] == [SCAM_MESSAGE, 'See you tomorrow']
+
+
+@pytest.mark.parametrize('path, body, error', [
+    ('/api/detect', {'message': '   '}, 'Message cannot be empty'),
+    ('/api/analyze-url', {'url': ''}, 'URL cannot be empty'),
+])
+def test_empty_input(client, path, body, error):
+    response = client.post(path, json=body)
+
+    assert response.status_code == 400
+    assert response.json() == {'error': error}
+
+
+@pytest.mark.parametrize('path, body, error', [
+    ('/api/detect', {}, 'Message field is required'),
+    ('/api/detect', [1, 2], 'Message field is required'),
+    ('/api/detect', 'not json', 'Message field is required'),
+    ('/api/detect', {'message': 5}, 'message: Input should be a valid string'),
+    ('/api/analyze-url', {}, 'URL field is required'),
+    ('/api/batch-detect', {}, 'Messages array is required'),
+    ('/api/batch-detect', 'not json', 'Messages array is required'),
+    ('/api/batch-detect', {'messages': 'hello'}, 'Messages must be an array'),
+    ('/api/batch-detect', {'messages': [5]}, 'messages.0: Input should be a valid string'),
+])
+def test_invalid_body(client, path, body, error):
+    if body == 'not json':
+        response = client.post(path, content=b'{not json',
+                               headers={'Content-Type': 'application/json'})
+    else:
+        response = client.post(path, json=body)
+
+    assert response.status_code == 400
+    assert response.json() == {'error': error}
+
+
+def test_static_index(client):
+    response = client.get('/')
+
+    assert response.status_code == 200
+    assert response.text == '<h1>Scam Detector</h1>'
+
+
+@pytest.mark.parametrize('path', ['/api/detect', '/no-such-route'])
+def test_cors_preflight(client, path):
+    response = client.options(path, headers={
+        'Origin': 'https://example.com',
+        'Access-Control-Request-Method': 'POST',
+        'Access-Control-Request-Headers': 'content-type, authorization',
+    })
+
+    assert response.status_code == 204
+    assert response.content == b''
+    assert response.headers['access-control-allow-origin'] == '*'
+    assert response.headers['access-control-allow-methods'] == 'POST, GET, OPTIONS'
+    assert response.headers['access-control-allow-headers'] == 'content-type, authorization'
+    assert response.headers['access-control-max-age'] == '86400'
+
+
+def test_cors_preflight_without_requested_headers(client):
+    response = client.options('/api/detect', headers={'Origin': 'https://example.com'})
+
+    assert response.status_code == 204
+    assert 'access-control-allow-headers' not in response.headers
+
+
+@pytest.mark.parametrize('method, path, body, status', [
+    ('POST', '/api/detect', {'message': SCAM_MESSAGE}, 200),
+    ('POST', '/api/detect', {}, 400),
+    ('GET', '/health', None, 200),
+    ('GET', '/', None, 200),
+])
+def test_cors_headers_on_responses(client, method, path, body, status):
+    response = client.request(method, path, json=body, headers={'Origin': 'https://example.com'})
+
+    assert response.status_code == status
+    assert response.headers['access-control-allow-origin'] == '*'
+    assert response.headers['access-control-allow-methods'] == 'POST, GET, OPTIONS'
+
+
+def test_lifespan_starts_and_stops_scheduler(api):
+    with TestClient(api.app):
+        worker = api.scheduler._worker
+        assert worker is not None and not worker.done()
+
+    assert api.scheduler._worker is None
+    assert worker.cancelled()
@@ -0,0 +1,123 @@
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from train import create_sample_dataset
+from scam_detector import ScamDetector
+
+MESSAGES = [
+    "URGENT! Your bank account has been suspended. Click http://secure-bank-verify.tk/login",
+    "Meeting at 3 PM today in conference room",
+]
+
+
+@pytest.fixture(scope='module')
+def dataset(tmp_path_factory):
+    dataset_path = create_sample_dataset(str(tmp_path_factory.mktemp('data') / 'sample_dataset.csv'))
+    df = pd.read_csv(dataset_path)
+    return df['message'].tolist(), df['label'].tolist()
+
+
+def probabilities(detector):
+    return detector._predict_proba(detector.vectorizer.transform(MESSAGES))
+
+
+def sklearn_probabilities(detector):
+    X = detector.vectorizer.transform(MESSAGES).astype(np.float32).toarray()
+    return detector.classifier.predict_proba(X)
+
+
+def test_hummingbird_files_removed_without_compiled_model(tmp_path, dataset):
+    pytest.importorskip('hummingbird.ml')
+    model_dir = tmp_path / 'models'
+
+    ScamDetector(model_dir=str(model_dir), use_hummingbird=True).train(*dataset)
+    assert (model_dir / 'classifier_hb.zip').exists()
+
+    ScamDetector(model_dir=str(model_dir)).train(*dataset)
+    assert not (model_dir / 'classifier_hb.zip').exists()
+    assert not (model_dir / 'classifier_hb.digest').exists()
+
+
+def test_stale_hummingbird_model_is_converted_again(tmp_path, dataset):
+    pytest.importorskip('hummingbird.ml')
+    model_dir = tmp_path / 'models'
+    saved = tmp_path / 'saved'
+    saved.mkdir()
+
+    ScamDetector(model_dir=str(model_dir), use_hummingbird=True).train(*dataset)
+    for name in ('classifier_hb.zip', 'classifier_hb.digest', 'model_info.json'):
+        shutil.copy(model_dir / name, saved / name)
+
+    # Retrain with a different vocabulary size, then put the old compiled
+    # model back, as a tree written by an older release would have it.
+    ScamDetector(model_dir=str(model_dir), feature_selection_threshold=None).train(*dataset)
+    for name in ('classifier_hb.zip', 'classifier_hb.digest', 'model_info.json'):
+        shutil.copy(saved / name, model_dir / name)
+
+    detector = ScamDetector(model_dir=str(model_dir), use_hummingbird=True)
+    detector.load_model()
+
+    assert detector._hb_model is not None
+    np.testing.assert_allclose(probabilities(detector), sklearn_probabilities(detector), atol=1e-5)
+
+
+def test_hummingbird_model_reloaded_when_current(tmp_path, dataset):
+    pytest.importorskip('hummingbird.ml')
+    model_dir = tmp_path / 'models'
+    ScamDetector(model_dir=str(model_dir), use_hummingbird=True).train(*dataset)
+
+    detector = ScamDetector(model_dir=str(model_dir), use_hummingbird=True)
+    detector._convert_hummingbird = lambda: pytest.fail("current model was converted again")
+    detector.load_model()
+
+    assert detector._hb_model is not None
+    np.testing.assert_allclose(probabilities(detector), sklearn_probabilities(detector), atol=1e-5)
+
+
+def test_onnx_file_removed_without_exported_model(tmp_path, dataset):
+    pytest.importorskip('onnxruntime')
+    pytest.importorskip('skl2onnx')
+    model_dir = tmp_path / 'models'
+
+    ScamDetector(model_dir=str(model_dir), use_onnx=True).train(*dataset)
+    assert (model_dir / 'classifier.onnx').exists()
+
+    ScamDetector(model_dir=str(model_dir)).train(*dataset)
+    assert not (model_dir / 'classifier.onnx').exists()
+
+
+def test_stale_onnx_model_is_exported_again(tmp_path, dataset):
+    pytest.importorskip('onnxruntime')
+    pytest.importorskip('skl2onnx')
+    model_dir = tmp_path / 'models'
+    saved = tmp_path / 'saved'
+    saved.mkdir()
+
+    ScamDetector(model_dir=str(model_dir), use_onnx=True).train(*dataset)
+    for name in ('classifier.onnx', 'model_info.json'):
+        shutil.copy(model_dir / name, saved / name)
+
+    ScamDetector(model_dir=str(model_dir), feature_selection_threshold=None).train(*dataset)
+    for name in ('classifier.onnx', 'model_info.json'):
+        shutil.copy(saved / name, model_dir / name)
+
+    detector = ScamDetector(model_dir=str(model_dir), use_onnx=True)
+    detector.load_model()
+
+    assert detector._onnx_model is not None
+    np.testing.assert_allclose(probabilities(detector), sklearn_probabilities(detector), atol=1e-5)
+
+
+def test_onnx_model_reloaded_when_current(tmp_path, dataset):
+    pytest.importorskip('onnxruntime')
+    pytest.importorskip('skl2onnx')
+    model_dir = tmp_path / 'models'
+    ScamDetector(model_dir=str(model_dir), use_onnx=True).train(*dataset)
+
+    detector = ScamDetector(model_dir=str(model_dir), use_onnx=True)
+    detector._convert_onnx = lambda: pytest.fail("current model was exported again")
+    detector.load_model()
+
+    assert detector._onnx_model is not None
+    np.testing.assert_allclose(probabilities(detector), sklearn_probabilities(detector), atol=1e-5)
@@ -0,0 +1,123 @@
+import time
+import asyncio
+import pytest
+from batch_scheduler import BatchScheduler
+
+
+class RecordingPredictor:
+    """Stub predict_many that records every batch it is given."""
+
+    def __init__(self, delay: float = 0.0, error: Exception = None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [{'text': text} for text in texts]
+
+
+def run(scheduler: BatchScheduler, test):
+    """Run test() with the scheduler's worker started, failing after 5 seconds."""
+    async def main():
+        scheduler.start()
+        try:
+            return await asyncio.wait_for(test(), 5)
+        finally:
+            await scheduler.stop()
+
+    return asyncio.run(main())
+
+
+def test_full_batch_flushes_without_waiting():
+    predictor = RecordingPredictor()
+    scheduler = BatchScheduler(predictor, max_batch=4, max_wait_ms=60_000)
+    texts = ['a', 'b', 'c', 'd']
+
+    results = run(scheduler, lambda: asyncio.gather(*(scheduler.submit(t) for t in texts)))
+
+    assert results == [{'text': t} for t in texts]
+    assert predictor.batches == [texts]
+
+
+def test_partial_batch_flushes_after_max_wait():
+    predictor = RecordingPredictor()
+    scheduler = BatchScheduler(predictor, max_batch=64, max_wait_ms=50)
+
+    async def test():
+        start = time.monotonic()
+        results = await asyncio.gather(*(scheduler.submit(t) for t in 'abc'))
+        return results, time.monotonic() - start
+
+    results, elapsed = run(scheduler, test)
+
+    assert results == [{'text': t} for t in 'abc']
+    assert predictor.batches == [['a', 'b', 'c']]
+    assert elapsed >= 0.04
+
+
+def test_backlog_is_split_into_max_batch_chunks():
+    predictor = RecordingPredictor()
+    scheduler = BatchScheduler(predictor, max_batch=4, max_wait_ms=20)
+    texts = [str(i) for i in range(10)]
+
+    results = run(scheduler, lambda: asyncio.gather(*(scheduler.submit(t) for t in texts)))
+
+    assert results == [{'text': t} for t in texts]
+    assert [len(batch) for batch in predictor.batches] == [4, 4, 2]
+
+
+def test_timed_out_request_is_skipped():
+    predictor = RecordingPredictor(delay=0.2)
+    scheduler = BatchScheduler(predictor, max_batch=2, max_wait_ms=1)
+
+    async def test():
+        impatient, patient = await asyncio.gather(
+            scheduler.submit('impatient', timeout=0.05),
+            scheduler.submit('patient'),
+            return_exceptions=True,
+        )
+        # The worker must survive delivering a result to a cancelled future.
+        later = await scheduler.submit('later')
+        return impatient, patient, later
+
+    impatient, patient, later = run(scheduler, test)
+
+    assert isinstance(impatient, asyncio.TimeoutError)
+    assert patient == {'text': 'patient'}
+    assert later == {'text': 'later'}
+    assert predictor.batches == [['impatient', 'patient'], ['later']]
+
+
+def test_prediction_error_reaches_every_request():
+    predictor = RecordingPredictor(error=ValueError("boom"))
+    scheduler = BatchScheduler(predictor, max_batch=3, max_wait_ms=20)
+
+    async def test():
+        results = await asyncio.gather(*(scheduler.submit(t) for t in 'abc'),
+                                       return_exceptions=True)
+        predictor.error = None
+        return results, await scheduler.submit('after', timeout=1)
+
+    results, after = run(scheduler, test)
+
+    assert len(results) == 3
+    assert all(isinstance(result, ValueError) for result in results)
+    assert predictor.batches[0] == ['a', 'b', 'c']
+    assert after == {'text': 'after'}
+
+
+def test_submit_starts_worker_lazily():
+    predictor = RecordingPredictor()
+    scheduler = BatchScheduler(predictor, max_batch=1)
+
+    async def main():
+        try:
+            return await scheduler.submit('a', timeout=5)
+        finally:
+            await scheduler.stop()
+
+    assert asyncio.run(main()) == {'text': 'a'}
@@ -0,0 +1,117 @@
+import numpy as np
+import pytest
+from train import create_sample_dataset, train_model
+from scam_detector import ScamDetector
+
+# The messages predict.py --test runs, with the URLs extract_urls finds in
+# each and their analyze_url results.
+EXAMPLES = [
+    ("Hi, how are you? Let's catch up tomorrow.", {}),
+    ("URGENT! Your bank account has been suspended. Click http://secure-bank-verify.tk/login to restore access immediately!", {
+        'http://secure-bank-verify.tk/login': (75, ['Contains keyword: verify', 'Contains keyword: login',
+                                                    'Contains keyword: secure', 'Contains keyword: bank',
+                                                    'Suspicious TLD']),
+        'secure-bank-verify.tk/login': (75, ['Contains keyword: verify', 'Contains keyword: login',
+                                             'Contains keyword: secure', 'Contains keyword: bank',
+                                             'Suspicious TLD']),
+    }),
+    ("Congratulations! You've won 10 lakhs. Pay 5000 processing fee to bit.ly/claim123", {
+        'bit.ly/claim123': (35, ['Contains keyword: claim', 'Shortened URL']),
+    }),
+    ("Enaku solla irukku, call me when free", {}),
+    ("FREE iPhone 15! Limited offer! Click www.free-iphone-claim.xyz/winner", {
+        'www.free-iphone-claim.xyz/winner': (60, ['Contains keyword: winner', 'Contains keyword: free',
+                                                  'Contains keyword: claim', 'Suspicious TLD']),
+    }),
+    ("Meeting at 3 PM today in conference room", {}),
+    ("Panam jeyikum! Investment guarantee 100%. Contact: http://192.168.1.1/invest", {
+        'http://192.168.1.1/invest': (20, ['IP address in URL']),
+    }),
+]
+MESSAGES = [text for text, _ in EXAMPLES]
+
+# Messages whose suspicious URLs force a SCAM verdict whatever the text model says.
+URL_FORCED_SCAMS = {MESSAGES[1], MESSAGES[4]}
+
+
+@pytest.fixture(scope='module')
+def model_dir(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp('predict_examples')
+    dataset_path = create_sample_dataset(str(tmp_path / 'sample_dataset.csv'))
+    train_model(dataset_path, model_dir=str(tmp_path / 'models'))
+    return str(tmp_path / 'models')
+
+
+@pytest.fixture
+def detector(model_dir):
+    detector = ScamDetector(model_dir=model_dir)
+    detector.load_model()
+    return detector
+
+
+@pytest.mark.parametrize('text, expected', EXAMPLES)
+def test_extract_and_analyze_urls(detector, text, expected):
+    urls = detector.extract_urls(text)
+
+    assert sorted(urls) == sorted(expected)
+    for url in urls:
+        result = detector.analyze_url(url)
+        score, reasons = expected[url]
+        assert result == {
+            'url': url,
+            'suspicion_score': score,
+            'is_suspicious': score >= 40,
+            'reasons': reasons,
+        }
+
+
+def test_predict_examples(detector):
+    # Analyze every URL so the URL fields do not depend on the text model.
+    detector.url_skip_threshold = 1.0
+    results = detector.predict_many(MESSAGES)
+
+    for (text, expected), result in zip(EXAMPLES, results):
+        assert result['text'] == text
+        assert result['urls_found'] == len(expected)
+        assert sorted(ua['url'] for ua in result['url_analyses']) == sorted(expected)
+        assert result['max_url_suspicion_score'] == max(
+            (score for score, _ in expected.values()), default=0)
+        assert result['has_suspicious_urls'] == any(score >= 40 for score, _ in expected.values())
+        assert result['text_scam_probability'] + result['text_safe_probability'] == pytest.approx(1)
+        assert result['verdict'] == ('SCAM' if result['is_scam'] else 'SAFE')
+        if text in URL_FORCED_SCAMS:
+            assert result['is_scam']
+            assert "Contains suspicious URLs" in result['reasons']
+
+
+def test_predict_matches_predict_many(detector):
+    batch = detector.predict_many(MESSAGES)
+    detector.clear_cache()
+
+    assert [detector.predict(text) for text in MESSAGES] == batch
+
+
+def test_url_analysis_skipped_for_decisive_text(detector, monkeypatch):
+    # Text scam probabilities on either side of url_skip_threshold; the real
+    # sample model never gets close to it.
+    text_scam_probs = {MESSAGES[1]: 0.97, MESSAGES[4]: 0.2}
+    monkeypatch.setattr(detector, '_predict_proba', lambda X: np.array(
+        [[1 - p, p] for p in text_scam_probs.values()]))
+
+    extracted = []
+    extract_urls = detector.extract_urls
+    monkeypatch.setattr(detector, 'extract_urls',
+                        lambda text: extracted.append(text) or extract_urls(text))
+
+    skipped, analyzed = detector.predict_many(list(text_scam_probs))
+
+    assert extracted == [MESSAGES[4]]
+    assert skipped['text_scam_probability'] > detector.url_skip_threshold
+    assert skipped['urls_found'] == 0
+    assert skipped['url_analyses'] == []
+    assert skipped['max_url_suspicion_score'] == 0
+    assert not skipped['has_suspicious_urls']
+    assert skipped['verdict'] == 'SCAM'
+
+    assert analyzed['urls_found'] == 1
+    assert analyzed['verdict'] == 'SCAM'
@@ -0,0 +1,43 @@
+import joblib
+import pandas as pd
+import pytest
+from train import create_sample_dataset
+from scam_detector import ScamDetector
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return ScamDetector(model_dir=str(tmp_path / 'models'))
+
+
+@pytest.mark.parametrize('text, expected_urls, expected_score', [
+    # The full-URL pattern stops at '~' and '#'; the bare-domain match that
+    # runs on to the end of the URL must still be reported.
+    ("Hi see http://paypal.com.evil.ru/~secure/verify now",
+     ['http://paypal.com.evil.ru/', 'paypal.com.evil.ru/~secure/verify'], 45),
+    ("http://example.com/#/verify/account/login",
+     ['http://example.com/', 'example.com/#/verify/account/login'], 45),
+])
+def test_extract_urls_keeps_overlapping_matches(detector, text, expected_urls, expected_score):
+    urls = detector.extract_urls(text)
+
+    assert sorted(urls) == sorted(expected_urls)
+    assert max(ua['suspicion_score'] for ua in detector.analyze_urls(urls)) == expected_score
+
+
+def test_saved_vectorizer_leaves_vocabulary_to_npy_files(tmp_path):
+    df = pd.read_csv(create_sample_dataset(str(tmp_path / 'sample_dataset.csv')))
+    texts = df['message'].tolist()
+    trained = ScamDetector(model_dir=str(tmp_path / 'models'))
+    trained.train(texts, df['label'].tolist())
+    assert trained.vectorizer.fixed_vocabulary_
+
+    saved = joblib.load(tmp_path / 'models' / 'vectorizer.joblib')
+    assert saved.vocabulary is None
+    assert not hasattr(saved, 'vocabulary_')
+
+    loaded = ScamDetector(model_dir=str(tmp_path / 'models'))
+    loaded.load_model()
+    assert loaded.vectorizer.vocabulary_ == trained.vectorizer.vocabulary_
+    assert loaded.classifier.n_jobs == 1
+    assert (loaded.vectorizer.transform(texts) != trained.vectorizer.transform(texts)).nnz == 0
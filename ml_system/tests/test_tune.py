@@ -0,0 +1,44 @@
+import json
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold
+from train import create_sample_dataset
+from scam_detector import ScamDetector, DEFAULT_CLASSIFIER_PARAMS, HYPERPARAMS_FILE
+from tune import tune, cross_val_f1, N_ESTIMATORS_GRID, MAX_DEPTH_GRID
+
+
+class RecordingDetector(ScamDetector):
+    """ScamDetector that remembers the vocabulary size of every fit."""
+
+    def fit(self, texts, labels):
+        super().fit(texts, labels)
+        self.fitted_sizes.append(len(self.vectorizer.vocabulary_))
+        return self
+
+
+def test_cross_validation_prunes_like_train(tmp_path):
+    df = pd.read_csv(create_sample_dataset(str(tmp_path / 'sample_dataset.csv')))
+    texts, labels = df['message'].tolist(), df['label'].tolist()
+    folds = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
+
+    pruned = RecordingDetector(model_dir=str(tmp_path / 'pruned'), cache_size=0)
+    pruned.fitted_sizes = []
+    full = RecordingDetector(model_dir=str(tmp_path / 'full'), cache_size=0,
+                             feature_selection_threshold=None)
+    full.fitted_sizes = []
+
+    cross_val_f1(pruned, texts, labels, DEFAULT_CLASSIFIER_PARAMS, folds)
+    cross_val_f1(full, texts, labels, DEFAULT_CLASSIFIER_PARAMS, folds)
+
+    assert len(pruned.fitted_sizes) == 3
+    assert all(p < f for p, f in zip(pruned.fitted_sizes, full.fitted_sizes))
+
+
+def test_tune_writes_hyperparams(tmp_path):
+    dataset_path = create_sample_dataset(str(tmp_path / 'sample_dataset.csv'))
+    model_dir = tmp_path / 'models'
+
+    best = tune(dataset_path, model_dir=str(model_dir), min_f1=0.0, cv=2)
+
+    assert json.loads((model_dir / HYPERPARAMS_FILE).read_text()) == best
+    assert best['n_estimators'] in N_ESTIMATORS_GRID
+    assert best['max_depth'] in MAX_DEPTH_GRID
@@ -0,0 +1,112 @@
+import re
+import random
+import pytest
+from scam_detector import ScamDetector, PHISHING_KEYWORDS, URL_SHORTENERS, SUSPICIOUS_TLDS
+
+_IP_RE = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+
+
+def reference_analyze_url(url: str):
+    """The original one-URL-at-a-time scorer that _score_urls replaced."""
+    suspicion_score = 0
+    reasons = []
+
+    url_lower = url.lower()
+
+    for keyword in PHISHING_KEYWORDS:
+        if keyword in url_lower:
+            suspicion_score += 15
+            reasons.append(f"Contains keyword: {keyword}")
+
+    if any(shortener in url_lower for shortener in URL_SHORTENERS):
+        suspicion_score += 20
+        reasons.append("Shortened URL")
+
+    if '@' in url:
+        suspicion_score += 25
+        reasons.append("Contains @ symbol")
+
+    if url.count('//') > 1:
+        suspicion_score += 20
+        reasons.append("Multiple slashes")
+
+    if any(tld in url_lower for tld in SUSPICIOUS_TLDS):
+        suspicion_score += 15
+        reasons.append("Suspicious TLD")
+
+    if _IP_RE.search(url):
+        suspicion_score += 20
+        reasons.append("IP address in URL")
+
+    if len(url) > 100:
+        suspicion_score += 10
+        reasons.append("Unusually long URL")
+
+    if url_lower.count('-') > 3:
+        suspicion_score += 10
+        reasons.append("Multiple hyphens")
+
+    suspicion_score = min(suspicion_score, 100)
+
+    return {
+        'url': url,
+        'suspicion_score': suspicion_score,
+        'is_suspicious': suspicion_score >= 40,
+        'reasons': reasons
+    }
+
+
+# Pieces that trigger (or nearly trigger) each heuristic, plus non-ASCII text
+# whose lowercase form differs in length or that \d matches.
+URL_PARTS = (
+    PHISHING_KEYWORDS + URL_SHORTENERS + SUSPICIOUS_TLDS
+    + ['http://', 'https://', 'www.', '.com', '/', '//', '-', '@', '.', '~', '#', '?q=', '%20',
+       '192.168.1.1', '10.0.0', '٣.١٢.٤.٥', '１２.３.４.５', 'İ', 'ẞ', 'Σ', 'ß', 'ﬁ', 'é', 'x' * 40]
+)
+
+
+def random_url(rng: random.Random) -> str:
+    parts = rng.choices(URL_PARTS, k=rng.randint(1, 12))
+    parts = [part.upper() if rng.random() < 0.3 else part for part in parts]
+    url = ''.join(parts)
+    # Land around the 100-character length check now and then.
+    if rng.random() < 0.3:
+        url = url[:98] + 'a' * max(0, rng.randint(98, 102) - len(url))
+    return url
+
+
+def generated_urls(n: int = 3000, seed: int = 0):
+    rng = random.Random(seed)
+    return [random_url(rng) for _ in range(n)]
+
+
+@pytest.fixture
+def detector(tmp_path):
+    return ScamDetector(model_dir=str(tmp_path / 'models'))
+
+
+def test_score_urls_matches_reference(detector):
+    urls = list(dict.fromkeys(generated_urls()))
+
+    assert detector._score_urls(urls) == [reference_analyze_url(url) for url in urls]
+
+
+def test_analyze_urls_matches_reference_with_repeats(detector):
+    # Repeats and a second call exercise the URL cache.
+    urls = generated_urls(500, seed=1) * 2
+    expected = [reference_analyze_url(url) for url in urls]
+
+    assert detector.analyze_urls(urls) == expected
+    assert detector.analyze_urls(urls) == expected
+
+
+@pytest.mark.parametrize('url', [
+    'HTTP://SECURE-BANK-VERIFY.TK/LOGIN',
+    'https://İstanbul-bank-login-verify-now.com',
+    'http://١٩٢.١٦٨.١.١/claim',
+    'user@ẞ.xyz//Paypal',
+    'x' * 101,
+    'İ' + 'x' * 99,
+])
+def test_analyze_url_matches_reference(detector, url):
+    assert detector.analyze_url(url) == reference_analyze_url(url)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+import json
+import argparse
+import logging
+import itertools
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+from scam_detector import ScamDetector, DEFAULT_CLASSIFIER_PARAMS, HYPERPARAMS_FILE
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+N_ESTIMATORS_GRID = [25, 50, 100, 200]
+MAX_DEPTH_GRID = [6, 12, 25, 50]
+
+
+def cross_val_f1(detector: ScamDetector, texts, labels, params, folds) -> float:
+    """Mean F1 over the folds, fitting each one the way ScamDetector.train does."""
+    texts = np.asarray(texts, dtype=object)
+    labels = np.asarray(labels)
+
+    scores = []
+    for train_idx, test_idx in folds.split(texts, labels):
+        # fit() also prunes the vocabulary, so each configuration is scored
+        # on the feature set it would actually be served with.
+        detector.classifier = RandomForestClassifier(**params)
+        detector.fit(texts[train_idx].tolist(), labels[train_idx])
+
+        y_pred = detector.classifier.predict(detector.vectorizer.transform(texts[test_idx].tolist()))
+        scores.append(f1_score(labels[test_idx], y_pred, zero_division=0))
+
+    return float(np.mean(scores))
+
+
+def tune(dataset_path: str, model_dir: str = './models', min_f1: float = 0.85,
+         cv: int = 5):
+    """Pick the cheapest RandomForest size whose cross-validated F1 meets min_f1."""
+    df = pd.read_csv(dataset_path)
+
+    if 'message' not in df.columns or 'label' not in df.columns:
+        raise ValueError("CSV must contain 'message' and 'label' columns")
+
+    texts = df['message'].astype(str).tolist()
+    labels = df['label'].astype(int).tolist()
+
+    n_splits = max(2, min(cv, pd.Series(labels).value_counts().min()))
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=42)
+    detector = ScamDetector(model_dir=model_dir, cache_size=0)
+
+    # Inference cost grows with the number of trees and their depth, so try
+    # the cheapest configurations first.
+    grid = sorted(itertools.product(N_ESTIMATORS_GRID, MAX_DEPTH_GRID),
+                  key=lambda config: config[0] * config[1])
+
+    results = []
+    selected = None
+    for n_estimators, max_depth in grid:
+        params = dict(DEFAULT_CLASSIFIER_PARAMS, n_estimators=n_estimators, max_depth=max_depth)
+        score = cross_val_f1(detector, texts, labels, params, folds)
+
+        logger.info(f"n_estimators={n_estimators:<4} max_depth={max_depth:<3} F1={score:.4f}")
+        results.append((score, n_estimators, max_depth))
+
+        if score >= min_f1:
+            selected = results[-1]
+            break
+
+    if selected is None:
+        logger.warning(f"No configuration reached F1 >= {min_f1}, using the best one found")
+        selected = max(results, key=lambda result: result[0])
+
+    score, n_estimators, max_depth = selected
+    best = {'n_estimators': n_estimators, 'max_depth': max_depth}
+
+    hyperparams_path = Path(model_dir) / HYPERPARAMS_FILE
+    with open(hyperparams_path, 'w') as f:
+        json.dump(best, f, indent=2)
+
+    logger.info(f"Selected {best} (F1={score:.4f}), saved to {hyperparams_path}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune scam detection model size")
+    parser.add_argument('--data', type=str, required=True, help='Path to training dataset CSV')
+    parser.add_argument('--model-dir', type=str, default='./models',
+                       help='Directory to write hyperparams.json to')
+    parser.add_argument('--min-f1', type=float, default=0.85,
+                       help='Minimum cross-validated F1 score (0-1)')
+    parser.add_argument('--cv', type=int, default=5, help='Number of cross-validation folds')
+
+    args = parser.parse_args()
+
+    tune(
+        dataset_path=args.data,
+        model_dir=args.model_dir,
+        min_f1=args.min_f1,
+        cv=args.cv
+    )
+
+
+if __name__ == '__main__':
+    main()